@@ -1,20 +1,33 @@
+from dataclasses import dataclass
 from matplotlib import pyplot as plt
 from matplotlib.colors import ListedColormap
 import numpy as np
-import seaborn as sb
 from sklearn.linear_model import Lasso, LinearRegression, LogisticRegression, Ridge
 from sklearn.metrics import confusion_matrix
 from statsmodels.regression.linear_model import RegressionResultsWrapper
 from statsmodels.stats.diagnostic import normal_ad
-from statsmodels.stats.outliers_influence import variance_inflation_factor
 import statsmodels.api as sm
 import pandas as pd
 from mpl_toolkits.mplot3d import Axes3D
 import plotly.express as px 
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional, get_sse falls back to NumPy without it
+    njit = None
+
 colors = ['#FF69B4', '#FFB6C1']  
 importance_palette = ['#E093B8', '#E093B8','#E093B8', '#F0A1C6', '#F0A1C6', '#F0A1C6', '#E3B8C6', '#E3B8C6','#E3B8C6', '#E6D1D4', '#E6D1D4', '#E6D1D4']
 palette = ['#E093B8', '#F0A1C6', '#E3B8C6', "#E6D1D4"] 
+palette3 = ['#F2BED1', '#FDCEDF', '#F8E8EE', "#F9F5F6"]
+confusion_cmap = ListedColormap(palette3)
+
+@dataclass(slots=True)
+class Residuals:
+    '''Actual values, predicted values and residuals of a model, kept as parallel arrays.'''
+    actual: np.ndarray
+    predicted: np.ndarray
+    resid: np.ndarray
 
 # functions for visualization of data
 def visualize_column(df, col_name, df_fixed=None):
@@ -32,11 +45,13 @@ def visualize_column(df, col_name, df_fixed=None):
 def bar_plot(data_frame, variable):
     '''This function creates a bar plot for a given variable in a DataFrame, 
     displaying the count of unique values with labels "No (0)" and "Yes (1)".'''
-    data = data_frame[variable]
-    values_count = data.value_counts()
+    data = data_frame[variable].to_numpy(copy=False)
+    if data.dtype.kind == 'f':
+        data = data[~np.isnan(data)]
+    values, counts = np.unique(data, return_counts=True)
     plt.figure(figsize=(10, 5))
-    bars = plt.bar(values_count.index, values_count, color=colors)
-    plt.xticks(values_count.index, values_count.index.values)
+    bars = plt.bar(values, counts, color=colors)
+    plt.xticks(values, values)
     plt.ylabel("Count")
     plt.title(variable)
     plt.legend([bars[0], bars[1]], ['No (0)', 'Yes (1)'], loc='upper right')
@@ -55,26 +70,11 @@ def plot_histogram(data_frame, variable):
 def bmi_histogram(data_frame):
     '''This function creates a bar plot showing the distribution of BMI categories 
     (Underweight, Healthy Weight, Overweight, Obesity) based on the "BMI" column in a DataFrame.'''
-    column = data_frame["BMI"]
-    frequency = {
-        "Underweight": 0,
-        "Healthy Weight": 0,
-        "Overweight": 0,
-        "Obesity": 0,
-    }
-
-    for bmi in column.values:
-        if bmi < 18.5:
-            frequency["Underweight"] += 1
-        elif bmi < 25:
-            frequency["Healthy Weight"] += 1
-        elif bmi < 30:
-            frequency["Overweight"] += 1
-        else:
-            frequency["Obesity"] += 1
-
-    group_names = list(frequency.keys())
-    group_counts = list(frequency.values())
+    column = data_frame["BMI"].to_numpy(copy=False)
+    group_names = ["Underweight", "Healthy Weight", "Overweight", "Obesity"]
+    # bucket index is the number of thresholds each value is at or above (NaN sorts last, into Obesity)
+    buckets = np.searchsorted([18.5, 25, 30], column, side='right')
+    group_counts = np.bincount(buckets, minlength=len(group_names))
     plt.figure(figsize=(10, 6))
     plt.bar(group_names, group_counts, color=colors[0])
     plt.title('BMI Categories Distribution')
@@ -133,7 +133,12 @@ def blood_group_histogram(data_frame):
 def check_for_missing_values(df): 
     '''This function checks for missing values in a DataFrame and returns a DataFrame 
     showing the number and percentage of missing values for each column with missing data.'''
-    missing_values = df.isna().sum()
+    # count column by column so no full N x p boolean frame is materialized
+    missing_values = {}
+    for col, series in df.items():
+        arr = series.to_numpy(copy=False)
+        missing_values[col] = np.count_nonzero(np.isnan(arr) if arr.dtype.kind == 'f' else pd.isna(arr))
+    missing_values = pd.Series(missing_values, dtype=np.int64)
     non_zero_missing = missing_values[missing_values != 0]
     non_zero_missing_percentage = (non_zero_missing / len(df)) * 100
     return pd.DataFrame({
@@ -141,12 +146,24 @@ def check_for_missing_values(df):
         '% missing': non_zero_missing_percentage
     })
 
+def plot_correlation_heatmap(corr, names):
+    '''This function draws a correlation matrix as a heatmap with matplotlib, 
+    writing the coefficients into the cells only when there are fewer than 20 features.'''
+    n_features = len(corr)
+    plt.imshow(corr, cmap='coolwarm', vmin=-1, vmax=1, aspect='auto')
+    plt.colorbar()
+    ticks = np.arange(n_features)
+    plt.xticks(ticks, names, rotation=45, ha='right')
+    plt.yticks(ticks, names)
+    if n_features < 20:
+        for (i, j), value in np.ndenumerate(corr):
+            plt.text(j, i, f'{value:.2f}', ha='center', va='center', fontsize=8)
+
 def correlation_matrix(data_frame):
     '''This function creates a heatmap of the correlation matrix of a DataFrame, 
     displaying the correlation coefficients between numerical features.'''
     plt.subplots(figsize=(30,10))
-    plt.xticks(rotation=45) 
-    sb.heatmap(data_frame.corr(), annot=True, fmt = ".2f")
+    plot_correlation_heatmap(data_frame.corr().to_numpy(), data_frame.columns)
     plt.show()  
 
 # functions for creating model
@@ -180,24 +197,96 @@ def get_logistic_model(features, labels):
     return logistic_model
 
 # functions for evulation of model
+def _predict_sm(model, features):
+    '''Predictions of a statsmodels regression result, which needs the constant column added first.'''
+    return np.asarray(model.predict(sm.add_constant(features, has_constant='add')))
+
+def _predict_sk(model, features):
+    '''Predictions of a scikit-learn estimator.'''
+    return np.asarray(model.predict(features))
+
+_predictors = {
+    RegressionResultsWrapper: _predict_sm,
+    LinearRegression: _predict_sk,
+    Lasso: _predict_sk,
+    Ridge: _predict_sk,
+    LogisticRegression: _predict_sk,
+}
+_predictor_cache = {}
+
+def _dispatch(model):
+    '''This function returns the prediction function for the type of the model. 
+    The class hierarchy is walked once per type and the result is cached; unknown types are treated like scikit-learn.'''
+    model_type = type(model)
+    predict = _predictor_cache.get(model_type)
+    if predict is None:
+        predict = next((_predictors[cls] for cls in model_type.__mro__ if cls in _predictors), _predict_sk)
+        _predictor_cache[model_type] = predict
+    return predict
+
+def _predict(model, features):
+    '''This function returns the predictions of a model as an array, 
+    adding the constant column first when the model is a statsmodels regression result.'''
+    return _dispatch(model)(model, features)
+
+def adjust_rsquared(r_squared, n, p):
+    '''This function adjusts an R-squared (R²) value for n observations and p predictors.'''
+    return 1 - (1 - r_squared) * (n - 1) / (n - p - 1)
+
+if njit is not None:
+    @njit(fastmath=True, cache=True, parallel=True)
+    def _sum_squared_residuals(y, y_pred):
+        '''Sum of squared residuals in one fused, parallel loop without temporary arrays.'''
+        sse = 0.0
+        for i in prange(y.size):
+            diff = y[i] - y_pred[i]
+            sse += diff * diff
+        return sse
+else:
+    def _sum_squared_residuals(y, y_pred):
+        '''Sum of squared residuals as a dot product of the residual vector with itself.'''
+        resid = y - y_pred
+        return resid @ resid
+
+def _sse(labels, y_pred):
+    '''This function calculates the Sum of Squared Errors (SSE) from actual and predicted values.'''
+    y = np.ascontiguousarray(labels, dtype=np.float64).ravel()
+    y_pred = np.ascontiguousarray(y_pred, dtype=np.float64).ravel()
+    # the kernel indexes both arrays by position, so their lengths must match
+    if y.shape != y_pred.shape:
+        raise ValueError(f"Labels and predictions have different lengths ({y.size} and {y_pred.size}).")
+    return float(_sum_squared_residuals(y, y_pred))
+
+def _rsquared_from_sse(sse, labels):
+    '''This function calculates R-squared (R²) from a residual sum of squares and the actual values. 
+    Like r2_score, constant labels give 1.0 for a perfect fit and 0.0 otherwise instead of nan.
+    Labels are flattened the same way _sse flattens them, so (n, 1) columns work too.'''
+    y = np.asarray(labels, dtype=np.float64).ravel()
+    centered = y - y.mean()
+    ss_tot = centered @ centered
+    if ss_tot == 0:
+        return 1.0 if sse == 0 else 0.0
+    return 1 - sse / ss_tot
+
+def _rsquared(labels, y_pred):
+    '''This function calculates R-squared (R²) from actual and predicted values, 
+    using the shared SSE kernel for the residual sum of squares (which also checks that the shapes match).'''
+    return _rsquared_from_sse(_sse(labels, y_pred), labels)
+
 def get_sse(model, features, labels):
     '''This function calculates the Sum of Squared Errors (SSE) for a given model, features, and labels. 
     It supports linear regression models and requires prediction functionality from the model.'''
     if hasattr(model, 'predict'):  
-        if isinstance(model, sm.regression.linear_model.RegressionResultsWrapper):
-            features = sm.add_constant(features, has_constant='add')
-        y_pred = model.predict(features)
-        sse = np.sum((labels - y_pred) ** 2)
+        y_pred = _predict(model, features)
+        sse = _sse(labels, y_pred)
         return sse
     raise ValueError("Unsupported model type for SSE calculation.")
 
 def get_rmse(model, features, labels):
     '''This function calculates the Root Mean Squared Error (RMSE) for a given model, features, and labels.'''
     if hasattr(model, 'predict'):
-        if isinstance(model, sm.regression.linear_model.RegressionResultsWrapper):
-            features = sm.add_constant(features, has_constant='add')
-        y_pred = model.predict(features)
-        rmse = np.sqrt(np.mean((labels - y_pred) ** 2))
+        y_pred = _predict(model, features)
+        rmse = np.sqrt(_sse(labels, y_pred) / len(y_pred))
         return rmse
     raise ValueError("Unsupported model type for RMSE calculation.")
 
@@ -205,11 +294,8 @@ def get_rsquared(model, features, labels):
     '''This function calculates the R-squared (R²) value for a given model, features, and labels, 
     indicating the proportion of variance explained by the model.'''
     if hasattr(model, 'predict'):
-        if isinstance(model, sm.regression.linear_model.RegressionResultsWrapper):
-            features = sm.add_constant(features, has_constant='add')
-        y_pred = model.predict(features)
-        from sklearn.metrics import r2_score
-        r_squared = r2_score(labels, y_pred)
+        y_pred = _predict(model, features)
+        r_squared = _rsquared(labels, y_pred)
         return r_squared
     raise ValueError("Unsupported model type for R² calculation.")
 
@@ -217,24 +303,23 @@ def get_rsquared_adj(model, features, labels):
     '''This function calculates the adjusted R-squared (R²) for a given model, features, and labels, 
     which adjusts R² for the number of predictors in the model.'''
     if hasattr(model, 'predict'):
-        num_attributes = features.shape[1]
-        if isinstance(model, sm.regression.linear_model.RegressionResultsWrapper):
-            features = sm.add_constant(features, has_constant='add')
-        y_pred = model.predict(features)
-        from sklearn.metrics import r2_score
-        r_squared = r2_score(labels, y_pred)
-        n = len(y_pred)
-        p = num_attributes
-        adjusted_r_squared = 1 - (1 - r_squared) * (n - 1) / (n - p - 1)
-        return adjusted_r_squared
+        y_pred = _predict(model, features)
+        r_squared = _rsquared(labels, y_pred)
+        return adjust_rsquared(r_squared, len(y_pred), features.shape[1])
     raise ValueError("Unsupported model type for adjusted R² calculation.")
 
 def evaluate_model(model, name, features, labels):
-    '''This function evaluates a model by calculating and printing its SSE, RMSE, R², and adjusted R² for given features and labels.'''
-    sse = get_sse(model, features, labels) 
-    rmse = get_rmse(model, features, labels)
-    rsquared = get_rsquared(model, features, labels)
-    rsquared_adj = get_rsquared_adj(model, features, labels)
+    '''This function evaluates a model by calculating and printing its SSE, RMSE, R², and adjusted R² for given features and labels.
+    The model is asked for predictions once and all four metrics are derived from the same residuals.'''
+    if not hasattr(model, 'predict'):
+        raise ValueError("Unsupported model type for evaluation.")
+    y = np.asarray(labels)
+    y_pred = _predict(model, features)
+    n = len(y)
+    sse = _sse(y, y_pred)
+    rmse = np.sqrt(sse / n)
+    rsquared = _rsquared_from_sse(sse, y)
+    rsquared_adj = adjust_rsquared(rsquared, n, features.shape[1])
 
     print(f"{name} Model:")
     print(f"SSE: {sse}")
@@ -245,22 +330,29 @@ def evaluate_model(model, name, features, labels):
 # fuctions for checking assumptions of the model
 def calculate_residuals(model, features, labels):
     '''This function calculates the residuals (difference between actual and predicted values) 
-    for a given model and returns them in a DataFrame along with actual and predicted values.'''
-    y_pred = model.predict(features)
-    df_results = pd.DataFrame({'Actual': labels, 'Predicted': y_pred})
-    df_results['Residuals'] = abs(df_results['Actual']) - abs(df_results['Predicted'])
-    return df_results
-
-def linear_assumption(model: LinearRegression | RegressionResultsWrapper, features: np.ndarray | pd.DataFrame, labels: pd.Series, p_value_thresh=0.05, plot=True):
+    for a given model and returns them as arrays in Residuals along with actual and predicted values.'''
+    # estimators fitted on a DataFrame check the column names, so only those without them get the bare array
+    if isinstance(features, pd.DataFrame) and not hasattr(model, 'feature_names_in_'):
+        features = features.values
+    labels_arr = np.asarray(labels)
+    y_pred = np.asarray(model.predict(features))
+    resid = np.subtract(labels_arr, y_pred)
+    return Residuals(actual=labels_arr, predicted=y_pred, resid=resid)
+
+def linear_assumption(model: LinearRegression | RegressionResultsWrapper, features: np.ndarray | pd.DataFrame, labels: pd.Series, p_value_thresh=0.05, plot=True, residuals=None):
     '''This function checks the linearity assumption for a linear regression model, 
-    and optionally plots the predicted vs. actual values, along with the line of perfect predictions.'''
-    df_results = calculate_residuals(model, features, labels)
-    y_pred = df_results['Predicted']
+    and optionally plots the predicted vs. actual values, along with the line of perfect predictions.
+    Precomputed residuals can be passed to skip predicting again.'''
+    if residuals is None:
+        residuals = calculate_residuals(model, features, labels)
+    actual, y_pred = residuals.actual, residuals.predicted
     
     if plot:
         plt.figure(figsize=(6,6))
-        plt.scatter(labels, y_pred, alpha=.5)
-        line_coords = np.linspace(np.concatenate([labels, y_pred]).min(), np.concatenate([labels, y_pred]).max())
+        plt.scatter(actual, y_pred, alpha=.5)
+        lo = min(float(np.min(actual)), float(np.min(y_pred)))
+        hi = max(float(np.max(actual)), float(np.max(y_pred)))
+        line_coords = np.linspace(lo, hi)
         plt.plot(line_coords, line_coords, color='darkorange', linestyle='--')
         plt.title('Linear assumption')
         plt.xlabel('Actual')
@@ -274,17 +366,20 @@ def linear_assumption(model: LinearRegression | RegressionResultsWrapper, featur
     else:
         return True, None
 
-def linear_assumption_lasso_ridge_logistic(model, features: np.ndarray | pd.DataFrame, labels: pd.Series, p_value_thresh=0.05, plot=True):
+def linear_assumption_lasso_ridge_logistic(model, features: np.ndarray | pd.DataFrame, labels: pd.Series, p_value_thresh=0.05, plot=True, residuals=None):
     '''This function checks the linearity assumption for Lasso or Ridge models, 
-    and optionally plots the predicted vs. actual values, along with the line of perfect predictions.'''
-    y_pred = model.predict(features)
-    residuals = labels - y_pred
-    df_results = pd.DataFrame({'Actual': labels, 'Predicted': y_pred, 'Residuals': residuals})
+    and optionally plots the predicted vs. actual values, along with the line of perfect predictions.
+    Precomputed residuals can be passed to skip predicting again.'''
+    if residuals is None:
+        residuals = calculate_residuals(model, features, labels)
+    actual, y_pred = residuals.actual, residuals.predicted
     
     if plot:
         plt.figure(figsize=(6,6))
-        plt.scatter(labels, y_pred, alpha=0.5)
-        line_coords = np.linspace(np.concatenate([labels, y_pred]).min(), np.concatenate([labels, y_pred]).max())
+        plt.scatter(actual, y_pred, alpha=0.5)
+        lo = min(float(np.min(actual)), float(np.min(y_pred)))
+        hi = max(float(np.max(actual)), float(np.max(y_pred)))
+        line_coords = np.linspace(lo, hi)
         plt.plot(line_coords, line_coords, color='darkorange', linestyle='--')
         plt.title('Linear assumption')
         plt.xlabel('Actual')
@@ -298,18 +393,23 @@ def linear_assumption_lasso_ridge_logistic(model, features: np.ndarray | pd.Data
     else:
         return True, None
     
-def independence_of_errors_assumption(model, features, labels, plot=True):
+def independence_of_errors_assumption(model, features, labels, plot=True, residuals=None):
     '''This function checks the assumption of independence of errors by calculating the Durbin-Watson statistic 
-    for residuals and optionally plotting the residuals vs. predicted values.'''
-    df_results = calculate_residuals(model, features, labels)
+    for residuals and optionally plotting the residuals vs. predicted values.
+    Precomputed residuals can be passed to skip predicting again.'''
+    if residuals is None:
+        residuals = calculate_residuals(model, features, labels)
+    y_pred, resid = residuals.predicted, residuals.resid
     
     if plot:
-        sb.scatterplot(x='Predicted', y='Residuals', data=df_results)
+        plt.scatter(y_pred, resid)
+        plt.xlabel('Predicted')
+        plt.ylabel('Residuals')
         plt.axhline(y=0, color='darkorange', linestyle='--')
         plt.show()
     
     from statsmodels.stats.stattools import durbin_watson
-    dw_value = durbin_watson(df_results['Residuals'])
+    dw_value = durbin_watson(resid)
     autocorrelation = None
     if dw_value < 1.5: autocorrelation = 'positive'
     elif dw_value > 2: autocorrelation = 'negative'
@@ -317,75 +417,139 @@ def independence_of_errors_assumption(model, features, labels, plot=True):
     
     return autocorrelation, dw_value
 
-def normality_of_errors_assumption(model, features, label, p_value_thresh=0.05, plot=True):
+def normality_of_errors_assumption(model, features, label, p_value_thresh=0.05, plot=True, residuals=None):
     '''This function checks the normality of errors assumption by testing the residuals 
-    for normality and optionally plotting the distribution of residuals.'''
-    df_results = calculate_residuals(model, features, label)
+    for normality and optionally plotting the distribution of residuals.
+    Precomputed residuals can be passed to skip predicting again.'''
+    if residuals is None:
+        residuals = calculate_residuals(model, features, label)
+    resid = residuals.resid
     
     if plot:
+        import seaborn as sb
         plt.title('Distribution of residuals')
-        sb.histplot(df_results['Residuals'], kde=True, kde_kws={'cut': 3})
+        sb.histplot(resid, kde=True, kde_kws={'cut': 3})
         plt.show()
     
-    p_value = normal_ad(df_results['Residuals'])[1]
+    p_value = normal_ad(resid)[1]
     dist_type = 'normal' if p_value >= p_value_thresh else 'non-normal'
     return dist_type, p_value
 
-def equal_variance_assumption(model, features, labels, p_value_thresh=0.05, plot=True):
+def equal_variance_assumption(model, features, labels, p_value_thresh=0.05, plot=True, residuals=None):
     '''This function checks the assumption of equal variance (homoscedasticity) of errors by using the Goldfeld-Quandt test, 
-    and optionally plots the residuals against predicted values.'''
-    df_results = calculate_residuals(model, features, labels)
+    and optionally plots the residuals against predicted values.
+    Precomputed residuals can be passed to skip predicting again.'''
+    if residuals is None:
+        residuals = calculate_residuals(model, features, labels)
+    y_pred, resid = residuals.predicted, residuals.resid
     
     if plot:
-        sb.scatterplot(x='Predicted', y='Residuals', data=df_results)
+        plt.scatter(y_pred, resid)
+        plt.xlabel('Predicted')
+        plt.ylabel('Residuals')
         plt.axhline(y=0, color='darkorange', linestyle='--')
         plt.show()
     
     if isinstance(model, LinearRegression):
         features = sm.add_constant(features)
     
-    p_value = sm.stats.het_goldfeldquandt(df_results['Residuals'], features)[1]
+    p_value = sm.stats.het_goldfeldquandt(resid, features)[1]
     dist_type = 'equal' if p_value >= p_value_thresh else 'non-equal'
     
     return dist_type, p_value
 
-def perfect_collinearity_assumption(features: pd.DataFrame, plot=True):
+def get_correlation_matrix(features):
+    '''This function calculates the Pearson correlation matrix of the feature columns as an array.'''
+    return np.corrcoef(np.asarray(features), rowvar=False)
+
+def perfect_collinearity_assumption(features: pd.DataFrame, plot=True, corr=None):
     '''This function checks for perfect collinearity in the feature set by calculating the correlation matrix, 
-    and optionally plotting the heatmap of correlations.'''
-    correlation_matrix = features.corr()
+    and optionally plotting the heatmap of correlations. A precomputed correlation matrix can be passed as corr.'''
+    correlation_matrix = get_correlation_matrix(features) if corr is None else corr
     
     if plot:
-        sb.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt='.2f', linewidths=0.1)
+        names = features.columns if isinstance(features, pd.DataFrame) else np.arange(len(correlation_matrix))
+        plot_correlation_heatmap(correlation_matrix, names)
         plt.title('Correlation Matrix')
         plt.show()
     
-    np.fill_diagonal(correlation_matrix.values, np.nan)
-    pos_perfect_collinearity = (correlation_matrix > 0.999).any().any()
-    neg_perfect_collinearity = (correlation_matrix < -0.999).any().any()
-    has_perfect_collinearity = pos_perfect_collinearity or neg_perfect_collinearity
+    # the matrix is symmetric, so only the pairs above the diagonal need checking
+    upper = np.triu_indices_from(correlation_matrix, k=1)
+    has_perfect_collinearity = bool((np.abs(correlation_matrix[upper]) > 0.999).any())
     
     return has_perfect_collinearity
 
-def calculate_vif(x_train):
-    '''This function calculates the Variance Inflation Factor (VIF) for each feature in the dataset.'''
+def _unexplained_ss(matrix):
+    '''This function returns, for every column of a Gram matrix, the sum of squares left unexplained when that column 
+    is regressed on all the others, i.e. 1 / inv(M)[i, i]. Columns for which the direct inverse fails or gives a value 
+    outside (0, M[i, i]] (round-off on a (nearly) singular matrix) are recomputed from a least-squares fit on the other columns.'''
+    n_columns = len(matrix)
+    diagonal = np.diag(matrix)
+    try:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            unexplained = 1 / np.diag(np.linalg.inv(matrix))
+    except np.linalg.LinAlgError:
+        unexplained = np.full(n_columns, np.nan)
+    unreliable = ~((unexplained > 0) & (unexplained <= diagonal * (1 + 1e-8)))
+    for i in np.flatnonzero(unreliable):
+        others = np.arange(n_columns) != i
+        coef = np.linalg.lstsq(matrix[np.ix_(others, others)], matrix[others, i], rcond=None)[0]
+        unexplained[i] = max(diagonal[i] - matrix[i, others] @ coef, 0.0)
+    return unexplained
+
+def _vif_from_unexplained(unexplained, total_ss):
+    '''This function turns unexplained sums of squares into VIF = 1 / (1 - R²). A column whose 1 - R² is below 1e-10 
+    is perfectly collinear and gets an infinite VIF; the rest are kept at or above 1.'''
+    with np.errstate(divide='ignore', invalid='ignore'):
+        one_minus_rsquared = unexplained / total_ss
+        vif = np.where(one_minus_rsquared > 1e-10, 1 / one_minus_rsquared, np.inf)
+    return np.maximum(vif, 1.0)
+
+def calculate_vif(x_train, corr=None):
+    '''This function calculates the Variance Inflation Factor (VIF) for each feature in the dataset.
+    When the correlation matrix of x_train is passed as corr, the VIFs are read from it instead of the data.'''
     x_train_with_const = sm.add_constant(x_train, has_constant='add')
+    if corr is not None:
+        # for standardized columns the total sum of squares is 1, so VIF_i = 1 / unexplained_i;
+        # zero-variance features have NaN rows in corr and, like the constant column, keep a VIF of 1
+        corr = np.asarray(corr, dtype=np.float64)
+        defined = np.isfinite(np.diag(corr))
+        feature_vif = np.ones(len(corr))
+        if defined.any():
+            feature_vif[defined] = _vif_from_unexplained(_unexplained_ss(corr[np.ix_(defined, defined)]), 1.0)
+        vif = np.concatenate([[1.0], feature_vif])
+        return pd.DataFrame({"Variable": x_train_with_const.columns, "VIF": vif})
+    # column-major so each per-column reduction walks contiguous memory
+    x = np.asfortranarray(x_train_with_const.values, dtype=np.float64)
+    # regressing column i on the others leaves SSE_i = 1 / inv(XᵀX)[i, i], so
+    # VIF_i = 1 / (1 - R²_i) = centered SS_i / SSE_i and one inversion covers every column
+    centered_ss = ((x - x.mean(axis=0)) ** 2).sum(axis=0)
+    vif = _vif_from_unexplained(_unexplained_ss(x.T @ x), centered_ss)
+    vif[centered_ss == 0] = 1.0
     vif_data = pd.DataFrame()
     vif_data["Variable"] = x_train_with_const.columns
-    vif_data["VIF"] = [variance_inflation_factor(x_train_with_const.values, i) 
-                       for i in range(x_train_with_const.shape[1])]
+    vif_data["VIF"] = vif
     
     return vif_data
 
-def are_assumptions_satisfied_linear(model, features, labels, p_value_thresh=0.05):
+def are_assumptions_satisfied_linear(model, features, labels, p_value_thresh=0.05, corr=None):
     '''This function checks if the assumptions for linear regression are satisfied:
     Linearity, Independence of errors (no autocorrelation), Normality of errors, 
     Equal variance (homoscedasticity), and no Perfect collinearity.'''
-    x_with_const = sm.add_constant(features)
-    is_linearity_found, p_value = linear_assumption(model, x_with_const, labels, p_value_thresh, plot=False)
-    autocorrelation, dw_value = independence_of_errors_assumption(model, x_with_const, labels, plot=False)
-    n_dist_type, p_value = normality_of_errors_assumption(model, x_with_const, labels, p_value_thresh, plot=False)
-    e_dist_type, p_value = equal_variance_assumption(model, x_with_const, labels, p_value_thresh, plot=False)
-    has_perfect_collinearity = perfect_collinearity_assumption(features, plot=False)
+    # convert to arrays once so predict and the tests below skip the DataFrame handling, except for
+    # estimators fitted on a DataFrame, which check the column names and so keep the DataFrame
+    features_arr = np.ascontiguousarray(np.asarray(features), dtype=np.float64)
+    labels_arr = np.asarray(labels, dtype=np.float64)
+    if hasattr(model, 'feature_names_in_'):
+        x_with_const = sm.add_constant(features)
+    else:
+        x_with_const = sm.add_constant(features_arr)
+    residuals = calculate_residuals(model, x_with_const, labels_arr)
+    is_linearity_found, p_value = linear_assumption(model, x_with_const, labels_arr, p_value_thresh, plot=False, residuals=residuals)
+    autocorrelation, dw_value = independence_of_errors_assumption(model, x_with_const, labels_arr, plot=False, residuals=residuals)
+    n_dist_type, p_value = normality_of_errors_assumption(model, x_with_const, labels_arr, p_value_thresh, plot=False, residuals=residuals)
+    e_dist_type, p_value = equal_variance_assumption(model, x_with_const, labels_arr, p_value_thresh, plot=False, residuals=residuals)
+    has_perfect_collinearity = perfect_collinearity_assumption(features_arr, plot=False, corr=corr)
     
     if not is_linearity_found:
         return "Linearity assumption is not satisfied."
@@ -400,15 +564,16 @@ def are_assumptions_satisfied_linear(model, features, labels, p_value_thresh=0.0
     else:
         return True
 
-def are_assumptions_satisfied_ridge_lasso(model, features, labels, p_value_thresh=0.05):
+def are_assumptions_satisfied_ridge_lasso(model, features, labels, p_value_thresh=0.05, corr=None):
     '''This function checks if the assumptions for Ridge and Lasso regression are satisfied:
     Linearity, Independence of errors (no autocorrelation), Normality of errors, 
     Equal variance (homoscedasticity), and no Perfect collinearity.'''
-    is_linearity_found, p_value = linear_assumption_lasso_ridge_logistic(model, features, labels, p_value_thresh, plot=False)
-    autocorrelation, dw_value = independence_of_errors_assumption(model, features, labels, plot=False)
-    n_dist_type, p_value = normality_of_errors_assumption(model, features, labels, p_value_thresh, plot=False)
-    e_dist_type, p_value = equal_variance_assumption(model, features, labels, p_value_thresh, plot=False)
-    has_perfect_collinearity = perfect_collinearity_assumption(features, plot=False)
+    residuals = calculate_residuals(model, features, labels)
+    is_linearity_found, p_value = linear_assumption_lasso_ridge_logistic(model, features, labels, p_value_thresh, plot=False, residuals=residuals)
+    autocorrelation, dw_value = independence_of_errors_assumption(model, features, labels, plot=False, residuals=residuals)
+    n_dist_type, p_value = normality_of_errors_assumption(model, features, labels, p_value_thresh, plot=False, residuals=residuals)
+    e_dist_type, p_value = equal_variance_assumption(model, features, labels, p_value_thresh, plot=False, residuals=residuals)
+    has_perfect_collinearity = perfect_collinearity_assumption(features, plot=False, corr=corr)
     
     if not is_linearity_found:
         return "Linearity assumption is not satisfied."
@@ -423,12 +588,13 @@ def are_assumptions_satisfied_ridge_lasso(model, features, labels, p_value_thres
     else:
         return True
     
-def are_assumptions_satisfied_logistic(model, features, labels, p_value_thresh=0.05):
+def are_assumptions_satisfied_logistic(model, features, labels, p_value_thresh=0.05, corr=None):
     '''This function checks if the assumptions for logistic regression are satisfied:
     Linearity (log-odds), Independence of errors (no autocorrelation), and no Perfect collinearity.'''
-    is_linearity_found, p_value = linear_assumption_lasso_ridge_logistic(model, features, labels, p_value_thresh, plot=False)
-    autocorrelation, dw_value = independence_of_errors_assumption(model, features, labels, plot=False)
-    vif = perfect_collinearity_assumption(features, plot=False)
+    residuals = calculate_residuals(model, features, labels)
+    is_linearity_found, p_value = linear_assumption_lasso_ridge_logistic(model, features, labels, p_value_thresh, plot=False, residuals=residuals)
+    autocorrelation, dw_value = independence_of_errors_assumption(model, features, labels, plot=False, residuals=residuals)
+    vif = perfect_collinearity_assumption(features, plot=False, corr=corr)
     
     if vif is not None:
         return "Perfect collinearity assumption is not satisfied."
@@ -439,14 +605,18 @@ def are_assumptions_satisfied_logistic(model, features, labels, p_value_thresh=0
     else:
         return True
         
-def check_model_assumptions(model, features, labels, p_value_thresh=0.05):
-    '''This function checks the assumptions for different models: LinearRegression, Ridge, Lasso, and LogisticRegression.'''
+def check_model_assumptions(model, features, labels, p_value_thresh=0.05, corr=None):
+    '''This function checks the assumptions for different models: LinearRegression, Ridge, Lasso, and LogisticRegression.
+    The correlation matrix of the features is calculated once here, unless it is passed in as corr 
+    (e.g. when the same features are checked for several models or also used for calculate_vif).'''
+    if corr is None:
+        corr = get_correlation_matrix(features)
     if isinstance(model, (LinearRegression, RegressionResultsWrapper)):
-        return are_assumptions_satisfied_linear(model, features, labels, p_value_thresh)
+        return are_assumptions_satisfied_linear(model, features, labels, p_value_thresh, corr=corr)
     if isinstance(model, (Ridge, Lasso)):
-        return are_assumptions_satisfied_ridge_lasso(model, features, labels, p_value_thresh)
+        return are_assumptions_satisfied_ridge_lasso(model, features, labels, p_value_thresh, corr=corr)
     elif isinstance(model, LogisticRegression):
-        return are_assumptions_satisfied_logistic(model, features, labels, p_value_thresh)
+        return are_assumptions_satisfied_logistic(model, features, labels, p_value_thresh, corr=corr)
     else:
         return "Model type not supported for assumption checks."
     
@@ -454,11 +624,36 @@ def check_model_assumptions(model, features, labels, p_value_thresh=0.05):
 
 def plot_comparison(data_frame, feature, label):
     '''The function displays a linear regression plot (lmplot) for the given feature and label, comparing data based on PCOS status.'''
+    import seaborn as sb
     figure= sb.lmplot(data=data_frame, x=feature, y=label, hue="PCOS(Y/N)", palette= colors)
     plt.show()
 
+def plot_comparisons(data_frame, features, labels):
+    '''The function displays the linear regression plots (lmplot) of several feature/label pairs in one figure, 
+    one panel per pair, comparing data based on PCOS status.'''
+    import seaborn as sb
+    # stack the pairs into one long-form frame so a single lmplot draws every panel
+    long_form = pd.concat([
+        pd.DataFrame({
+            'pair': f'{feature} vs {label}',
+            'feature_value': data_frame[feature].to_numpy(),
+            'label_value': data_frame[label].to_numpy(),
+            'PCOS(Y/N)': data_frame['PCOS(Y/N)'].to_numpy(),
+        })
+        for feature, label in zip(features, labels)
+    ], ignore_index=True)
+    grid = sb.lmplot(data=long_form, x='feature_value', y='label_value', col='pair', hue='PCOS(Y/N)', palette=colors,
+                     col_wrap=3, facet_kws={'sharex': False, 'sharey': False})
+    grid.set_titles('{col_name}')
+    for ax, feature, label in zip(grid.axes.flat, features, labels):
+        ax.set_xlabel(feature)
+        ax.set_ylabel(label)
+    grid.tight_layout()
+    plt.show()
+
 def plot_pcos_swarmbox(data_frame, features):
     '''The function displays a swarmplot and a bokenplot for each of the characteristics in relation to PCOS status.'''
+    import seaborn as sb
     for feature in features:
         sb.swarmplot(x=data_frame["PCOS(Y/N)"], y=data_frame[feature], color="purple", alpha=0.5 )
         sb.boxenplot(x=data_frame["PCOS(Y/N)"], y=data_frame[feature], palette=colors)
@@ -466,12 +661,11 @@ def plot_pcos_swarmbox(data_frame, features):
 
 def plot_logistic_confusion_matrix(model, x_test, y_test):
     ''' Function to generate and plot a confusion matrix for a logistic regression model.'''
+    import seaborn as sb
     predictions = model.predict(x_test)
     cm = confusion_matrix(y_test, predictions)
-    palette3 = ['#F2BED1', '#FDCEDF', '#F8E8EE', "#F9F5F6"]
-    cmap = ListedColormap(palette3)
     plt.figure(figsize=(8, 6))
-    sb.heatmap(cm, annot=True, fmt='d', cmap=cmap, cbar=False, 
+    sb.heatmap(cm, annot=True, fmt='d', cmap=confusion_cmap, cbar=False, 
                vmin=0, vmax=cm.max(),
                xticklabels=["Not Pcos", "Pcos"], yticklabels=["Not Pcos", "Pcos"])
     plt.title("Confusion Matrix for Logistic Regression Model", fontsize=16)
@@ -481,6 +675,7 @@ def plot_logistic_confusion_matrix(model, x_test, y_test):
 
 def visualize_feature_importance(model, data_frame):
     '''Function to plot the feature importance of a logistic regression model using the coefficients. '''
+    import seaborn as sb
     if model.coef_.ndim == 1:  
         feature_importance = np.abs(model.coef_[0])  
     else:  
@@ -497,12 +692,41 @@ def visualize_feature_importance(model, data_frame):
     plt.ylabel("Feature", fontsize=14)
     plt.show()
 
-def plot_pairplot(data_frame):
-    '''Creates a pairplot for visualizing relationships between features and label'''
+def plot_pairplot(data_frame, fast=False):
+    '''Creates a pairplot for visualizing relationships between features and label.
+    With fast=True the grid is drawn directly with matplotlib (histograms instead of KDEs on the diagonal).'''
     features = ["Age(yrs)", "BMI", "Cycle length(days)"]
     label = ["PCOS(Y/N)"]
     selected_columns = features + label
-    sb.pairplot(data_frame[selected_columns], diag_kind='kde', corner=True, hue='PCOS(Y/N)', palette=colors)
+    if not fast:
+        import seaborn as sb
+        sb.pairplot(data_frame[selected_columns], diag_kind='kde', corner=True, hue='PCOS(Y/N)', palette=colors)
+        plt.suptitle('Pairplot of Features and Targets', y=1.02)
+        plt.show()
+        return
+
+    values = data_frame[features].to_numpy()
+    hue = data_frame[label[0]].to_numpy()
+    groups = np.unique(hue)
+    n_features = len(features)
+    fig, axes = plt.subplots(n_features, n_features, figsize=(2.5 * n_features, 2.5 * n_features))
+    for i in range(n_features):
+        for j in range(n_features):
+            ax = axes[i, j]
+            if j > i:
+                ax.set_visible(False)
+                continue
+            for group, color in zip(groups, colors):
+                mask = hue == group
+                if i == j:
+                    ax.hist(values[mask, i], bins=20, color=color, alpha=0.6)
+                else:
+                    ax.scatter(values[mask, j], values[mask, i], s=10, color=color, alpha=0.7)
+            if i == n_features - 1:
+                ax.set_xlabel(features[j])
+            if j == 0:
+                ax.set_ylabel(features[i])
+    fig.legend([str(group) for group in groups], title=label[0], loc='upper right')
     plt.suptitle('Pairplot of Features and Targets', y=1.02)
     plt.show()
 
@@ -541,8 +765,7 @@ def pcos_visualization(data_frame, logistic_model, x_test, y_test):
 
     features = ["Age(yrs)","Age(yrs)", "Age(yrs)","Follicle No.(R)","Avg. F size(L)(mm)"]
     labels = ["Cycle length(days)", "BMI", "Cycle(R/I)", "Follicle No.(L)", "Avg. F size(R)(mm)"]
-    for i in range(len(features)):
-        plot_comparison(data_frame, features[i], labels[i])
+    plot_comparisons(data_frame, features, labels)
 
     plot_logistic_confusion_matrix(logistic_model, x_test, y_test)
     visualize_feature_importance(logistic_model, x_test)
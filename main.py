@@ -109,21 +109,22 @@ def main():
     print(f"Logistic Regression Accuracy on Train: {logistic_score_train:.2f}%")
     print(f"Logistic Regression Accuracy on Test: {logistic_score_test:.2f}%")
 
-    # Check model assumptions for each model
-    result_linear = check_model_assumptions(linear_model, x_train, y_train)
+    # Check model assumptions for each model, sharing one correlation matrix of the training features
+    corr = get_correlation_matrix(x_train)
+    result_linear = check_model_assumptions(linear_model, x_train, y_train, corr=corr)
     print(result_linear)
 
-    result_ridge = check_model_assumptions(ridge_model, x_train, y_train)
+    result_ridge = check_model_assumptions(ridge_model, x_train, y_train, corr=corr)
     print(result_ridge)
 
-    result_lasso = check_model_assumptions(lasso_model, x_train, y_train)
+    result_lasso = check_model_assumptions(lasso_model, x_train, y_train, corr=corr)
     print(result_lasso)
 
-    result_logistic = check_model_assumptions(logistic_model, x_train, y_train)
+    result_logistic = check_model_assumptions(logistic_model, x_train, y_train, corr=corr)
     print(result_logistic)
 
     # Calculate Variance Inflation Factor (VIF)
-    vif_result = calculate_vif(x_train)
+    vif_result = calculate_vif(x_train, corr=corr)
     print(vif_result)
 
     pcos_visualization(df, logistic_model, x_test, y_test)